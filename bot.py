@@ -1,12 +1,58 @@
 import os
+import sys
 import time
+import queue
+import atexit
+import logging
+from logging.handlers import QueueHandler, QueueListener
+import json
+import math
+import random
+import functools
 import asyncio
-from datetime import datetime, timedelta
+
+# orjson is optional - patch json.loads before aiohttp and the SDK bind it,
+# so REST and websocket payloads are decoded by the faster parser
+try:
+    import orjson
+except ImportError:
+    pass
+else:
+    _std_json_loads = json.loads
+
+    def _fast_json_loads(s, *args, **kwargs):
+        # orjson takes no hooks/options and rejects NaN; defer to stdlib for those
+        if args or kwargs:
+            return _std_json_loads(s, *args, **kwargs)
+        try:
+            return orjson.loads(s)
+        except orjson.JSONDecodeError:
+            return _std_json_loads(s)
+
+    json.loads = _fast_json_loads
+
+import aiohttp
+from collections import deque
+from datetime import timedelta
+from decimal import Decimal
 
 # Load .env BEFORE everything
 from dotenv import load_dotenv
 load_dotenv()
 
+# Log through a queue so formatting and stdout writes happen on a worker
+# thread instead of blocking the event loop
+logger = logging.getLogger('grvt_bot')
+logger.setLevel(os.getenv('LOG_LEVEL', 'INFO').upper())
+logger.propagate = False
+_log_queue = queue.Queue(-1)
+logger.addHandler(QueueHandler(_log_queue))
+_log_handler = logging.StreamHandler(sys.stdout)
+_log_handler.setFormatter(logging.Formatter('%(message)s'))
+_log_listener = QueueListener(_log_queue, _log_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
 # Get values from .env immediately
 api_key = os.getenv('GRVT_API_KEY')
 private_key = os.getenv('GRVT_PRIVATE_KEY')
@@ -15,14 +61,14 @@ environment = os.getenv('ENVIRONMENT', 'testnet')
 
 # Validate
 if not api_key:
-    print("❌ ERROR: GRVT_API_KEY not found in .env!")
+    logger.error("❌ ERROR: GRVT_API_KEY not found in .env!")
     exit(1)
 if not private_key:
-    print("❌ ERROR: GRVT_PRIVATE_KEY not found in .env!")
-    print(f"   Current value: {private_key if private_key else 'None/Empty'}")
+    logger.error("❌ ERROR: GRVT_PRIVATE_KEY not found in .env!\n"
+                 f"   Current value: {private_key if private_key else 'None/Empty'}")
     exit(1)
 if not trading_account_id:
-    print("❌ ERROR: GRVT_SUB_ACCOUNT_ID not found in .env!")
+    logger.error("❌ ERROR: GRVT_SUB_ACCOUNT_ID not found in .env!")
     exit(1)
 
 # Set environment variables BEFORE any SDK imports
@@ -34,20 +80,180 @@ os.environ['GRVT_END_POINT_VERSION'] = 'v1'
 os.environ['GRVT_WS_STREAM_VERSION'] = 'v1'
 
 # Verify environment variables are set
-print(f"🔑 Verifying environment variables BEFORE SDK import:")
-print(f"  os.environ['GRVT_API_KEY']: {os.environ.get('GRVT_API_KEY', 'NOT SET')[:10]}...")
-print(f"  os.environ['GRVT_PRIVATE_KEY']: {os.environ.get('GRVT_PRIVATE_KEY', 'NOT SET')[:10]}... (len={len(os.environ.get('GRVT_PRIVATE_KEY', ''))})")
-print(f"  os.environ['GRVT_TRADING_ACCOUNT_ID']: {os.environ.get('GRVT_TRADING_ACCOUNT_ID', 'NOT SET')}")
-print(f"  os.environ['GRVT_ENV']: {os.environ.get('GRVT_ENV', 'NOT SET')}")
-print()
+logger.info("\n".join([
+    f"🔑 Verifying environment variables BEFORE SDK import:",
+    f"  os.environ['GRVT_API_KEY']: {os.environ.get('GRVT_API_KEY', 'NOT SET')[:10]}...",
+    f"  os.environ['GRVT_PRIVATE_KEY']: {os.environ.get('GRVT_PRIVATE_KEY', 'NOT SET')[:10]}... (len={len(os.environ.get('GRVT_PRIVATE_KEY', ''))})",
+    f"  os.environ['GRVT_TRADING_ACCOUNT_ID']: {os.environ.get('GRVT_TRADING_ACCOUNT_ID', 'NOT SET')}",
+    f"  os.environ['GRVT_ENV']: {os.environ.get('GRVT_ENV', 'NOT SET')}",
+    "",
+]))
 
 # NOW import SDK - it should read the env vars we just set
 from pysdk.grvt_ccxt_pro import GrvtCcxtPro
 from pysdk.grvt_ccxt_env import GrvtEnv
 
+# Errors worth backing off on: the request may succeed if retried later
+TRANSIENT_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError, ConnectionError)
+
+# Fills requested per REST poll (the SDK defaults to 10)
+FILLS_PAGE_LIMIT = 1000
+
+# GRVT reserves client order ids in [0, 2^63 - 1] for UI-generated orders;
+# API clients should use [2^63, 2^64 - 1] so the two never collide
+CLIENT_ORDER_ID_BASE = 2 ** 63
+CLIENT_ORDER_ID_SPAN = 2 ** 63
+
+# How long a cancel by client order id stays active on the exchange, so it
+# still lands if it arrives before the order it targets
+CANCEL_TTL_MS = 1000
+
+class RequestRejected(Exception):
+    """A request the SDK answered with an empty result instead of raising
+
+    Carries the exchange's error response ({'code', 'message', 'status'}) when
+    the SDK kept one.
+    """
+
+    def __init__(self, response=None):
+        response = response if isinstance(response, dict) else {}
+        self.status = response.get('status')
+        self.code = response.get('code')
+        message = response.get('message') or 'no result returned'
+        super().__init__(f"{message} (code={self.code}, status={self.status})")
+
+def is_rate_limited(error):
+    """Check whether an error is a rate-limit rejection (HTTP 429)"""
+    if getattr(error, 'status', None) == 429:
+        return True
+    message = str(error).lower()
+    return '429' in message or 'rate limit' in message or 'too many requests' in message
+
+def is_transient(error):
+    """Check whether an error is a rate-limit, server or network failure"""
+    status = getattr(error, 'status', None)
+    return (isinstance(error, TRANSIENT_ERRORS)
+            or (isinstance(status, int) and status >= 500)
+            or is_rate_limited(error))
+
+def is_order_gone(error):
+    """Check whether a cancel failed because the order already filled or was cancelled"""
+    message = str(error).lower()
+    return 'not found' in message or 'not exist' in message or 'filled' in message
+
+def order_id_of(result):
+    """Id a create_order result was acked with, or None if it wasn't placed
+
+    GRVT may ack an order before assigning it an id (order_id '0x00'); the
+    client_order_id echoed back in its metadata identifies it then.
+    """
+    if not isinstance(result, dict):
+        return None
+    order_id = result.get('order_id') or result.get('id')
+    if order_id and order_id != '0x00':
+        return order_id
+    metadata = result.get('metadata')
+    if isinstance(metadata, dict):
+        return metadata.get('client_order_id') or None
+    return None
+
+def parse_fill(trade):
+    """(event_time_ns, trade_id, cost) of a GRVT fill
+
+    GRVT fills carry 'event_time' (ns), 'price', 'size' and 'trade_id' as strings.
+    """
+    return (
+        int(trade.get('event_time') or 0),
+        trade.get('trade_id'),
+        float(trade.get('price') or 0) * float(trade.get('size') or 0)
+    )
+
+def grvt_top_of_book(bids, asks):
+    """Best bid/ask prices from GRVT-format levels ({'price': ..., 'size': ...})"""
+    return float(bids[0]['price']), float(asks[0]['price'])
+
+def ccxt_top_of_book(bids, asks):
+    """Best bid/ask prices from CCXT-format levels ([price, size])"""
+    return float(bids[0][0]), float(asks[0][0])
+
+def aggregate_fills(trades, since_ns, remember):
+    """Sum the cost of fills at or after since_ns that haven't been counted
+
+    Returns (volume, count, newest_ts). Totals are kept in locals so the
+    loop does no attribute lookups on the bot per trade.
+    """
+    volume = 0.0
+    count = 0
+    newest_ts = since_ns
+    for trade in trades:
+        # Handle different trade formats
+        if not isinstance(trade, dict):
+            continue
+
+        timestamp, trade_id, cost = parse_fill(trade)
+        if timestamp == 0 or timestamp < since_ns:
+            continue
+
+        # `since` is inclusive, so fills at the cursor may already be counted
+        if trade_id is not None:
+            if not remember(trade_id):
+                continue
+        elif timestamp == since_ns:
+            continue
+
+        volume += cost
+        count += 1
+        if timestamp > newest_ts:
+            newest_ts = timestamp
+    return volume, count, newest_ts
+
+
+class TokenBucket:
+    """Async token bucket whose refill rate adapts to rate-limit responses"""
+
+    def __init__(self, rate, burst):
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, n=1):
+        """Wait until n tokens are available and take them (rate <= 0 disables)"""
+        if self.max_rate <= 0:
+            return
+        n = min(n, self.burst)
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= n:
+                    self.tokens -= n
+                    return
+                await asyncio.sleep((n - self.tokens) / self.rate)
+
+    def penalize(self):
+        """Halve the rate and drain the bucket after a rate-limit error"""
+        self.rate = max(self.rate * 0.5, self.max_rate / 64)
+        self.tokens = 0.0
+
+    def reward(self):
+        """Recover towards the configured rate after a clean request"""
+        self.rate = min(self.max_rate, self.rate * 1.05)
+
+
+def emit(lines):
+    """Log a block of output lines as a single record"""
+    logger.info("\n".join(lines))
+
 class GRVTVolumeBot:
     def __init__(self):
         # Market & Trading Settings
+        # Credentials/environment were read and validated at import
+        self.environment = environment.lower()
+        self.trading_account_id = trading_account_id
         self.market = os.getenv('MARKET', 'BTC_USDT_Perp')
         self.leverage = int(os.getenv('LEVERAGE', '10'))
         self.investment_usdc = float(os.getenv('INVESTMENT_USDC', '10'))
@@ -62,28 +268,101 @@ class GRVTVolumeBot:
         self.orders_per_side = int(os.getenv('ORDERS_PER_SIDE', '10'))
         self.order_size_percent = float(os.getenv('ORDER_SIZE_PERCENT', '0.1'))
         self.refresh_interval = float(os.getenv('REFRESH_INTERVAL', '2.0'))
+        self.min_repost_interval = float(os.getenv('MIN_REPOST_INTERVAL', '0.2'))
         
         # Rate Limit Protection
-        self.delay_between_orders = float(os.getenv('DELAY_BETWEEN_ORDERS', '0.05'))
-        self.delay_after_cancel = float(os.getenv('DELAY_AFTER_CANCEL', '0.3'))
+        self.max_concurrent_orders = int(os.getenv('MAX_CONCURRENT_ORDERS', '20'))
+        self.delay_after_cancel = float(os.getenv('DELAY_AFTER_CANCEL', '0'))
         self.status_interval = int(os.getenv('STATUS_INTERVAL', '30'))
         self.max_orders_to_place = int(os.getenv('MAX_ORDERS_TO_PLACE', '10'))
+        self.max_backoff = float(os.getenv('MAX_BACKOFF', '30'))
+        self.max_consecutive_fails = int(os.getenv('MAX_CONSECUTIVE_FAILS', '5'))
+        self.max_order_rate = float(os.getenv('MAX_ORDER_RATE', '20'))
         
         # Advanced Settings
         self.use_post_only = os.getenv('USE_POST_ONLY', 'true').lower() == 'true'
+
+        # Order params are identical for every order - build them once
+        # GRVT requires sub_account_id in the order params
+        self._order_params = {
+            'sub_account_id': self.trading_account_id
+        }
+        if self.use_post_only:
+            self._order_params['post_only'] = True  # Try snake_case
+
+        # Sizing constants - capital and spread don't change during a session
+        self._order_value = self.investment_usdc * self.leverage * self.order_size_percent
+        self._spread_frac = self.spread_bps / 10000
+
+        # Session constants used in per-cycle output
+        self._base_ccy = self.market.split('_')[0]
+        self._target_volume_fmt = f"${self.target_volume:,.0f}"
+        self._required_rate_fmt = f"${self.target_volume / self.target_hours:,.0f}/hour"
+
+        # Market precision (defaults for BTC_USDT_Perp, refreshed from market info)
+        self.tick_size = 0.1
+        self.min_size = 0.001
+        self._price_decimals = 1
+        self._price_scale = 10
+        self._tick_i = 1
+        self._size_scale = 1000
+        self._min_size_i = 1
         
         # Initialize client
         self.client = None
-        self.start_time = None
         self.total_volume = 0
         self.total_trades = 0
         self.total_loss = 0
         self.cycle_count = 0
+
+        # Live orders in fixed slots reused every cycle (first _ord_count are
+        # valid), keyed by the client order id they were placed with
+        max_orders = 2 * min(self.orders_per_side, self.max_orders_to_place)
+        self._ord_ids = [None] * max_orders
+        self._ord_sides = [None] * max_orders
+        self._ord_prices = [0.0] * max_orders
+        self._ord_count = 0
+        # Offset into the API client id range; random start so restarts don't
+        # collide with ids still live on the exchange
+        self.client_order_id = random.randrange(CLIENT_ORDER_ID_SPAN)
+        # Set when a by-id cancel fails, so the next cycle sweeps with cancel-all
+        self._cancel_all_pending = False
+        # Bulk order endpoint, if the SDK supports one (detected in initialize)
+        self._create_orders = None
+        # Client calls pre-bound to this market in initialize
+        self._place = None
+        self._cancel_all = None
+
+        self.running = False
+        self.latest_orderbook = None
+        self._book_updates = 0
+        self._book_task = None
+        self._book_dirty = asyncio.Event()
+        self._book_ready = asyncio.Event()
+        self._extract_prices = None
+        self._quoted_bid = 0.0
+        self._quoted_ask = 0.0
+        # Mid and fill count at the last re-quote, to skip no-op refreshes
+        self._last_mid = None
+        self._quoted_trades = 0
+        # Ids of recently counted fills, bounded so multi-day runs stay O(1) in memory
+        self._recent_fills = deque(maxlen=1024)
+        self._recent_fill_ids = set()
+        # Fill cursor, in nanoseconds like GRVT's event_time
+        self._last_fill_ts = 0
+        self._start_mono = 0.0
+        self._last_status = 0.0
+
+        # Backoff state for rate-limit/network failures
+        self._backoff = 1.0
+        self._consecutive_fails = 0
+        self._order_semaphore = asyncio.Semaphore(self.max_concurrent_orders)
+        # Full order rate while the exchange is happy; throttles on 429s
+        self._order_bucket = TokenBucket(self.max_order_rate, len(self._ord_ids))
         
     async def initialize(self):
         """Initialize GRVT client"""
         # Map environment string to GrvtEnv enum
-        env_string = os.getenv('ENVIRONMENT', 'testnet').lower()
         env_map = {
             'testnet': GrvtEnv.TESTNET,
             'prod': GrvtEnv.PROD,
@@ -92,14 +371,11 @@ class GRVTVolumeBot:
             'staging': GrvtEnv.STAGING
         }
         
-        env = env_map.get(env_string, GrvtEnv.TESTNET)
+        env = env_map.get(self.environment, GrvtEnv.TESTNET)
         
-        # Get trading account ID
-        trading_account_id = os.getenv('GRVT_SUB_ACCOUNT_ID') or os.getenv('GRVT_TRADING_ACCOUNT_ID')
-        
-        if not trading_account_id:
-            print("❌ ERROR: GRVT_SUB_ACCOUNT_ID is not set in .env file!")
-            print("Please add: GRVT_SUB_ACCOUNT_ID=your_trading_account_id")
+        if not self.trading_account_id:
+            logger.error("❌ ERROR: GRVT_SUB_ACCOUNT_ID is not set in .env file!\n"
+                         "Please add: GRVT_SUB_ACCOUNT_ID=your_trading_account_id")
             raise ValueError("Missing GRVT_SUB_ACCOUNT_ID")
         
         # Initialize GRVT CCXT Pro client
@@ -107,14 +383,16 @@ class GRVTVolumeBot:
         
         # CRITICAL: SDK does NOT read from environment variables!
         # Must set all these attributes manually:
-        self.client._api_key = os.getenv('GRVT_API_KEY')
-        self.client._private_key = os.getenv('GRVT_PRIVATE_KEY')
-        self.client._trading_account_id = trading_account_id
+        self.client._api_key = api_key
+        self.client._private_key = private_key
+        self.client._trading_account_id = self.trading_account_id
         
-        print(f"✅ Set client attributes:")
-        print(f"  _api_key: {self.client._api_key[:10] if self.client._api_key else 'NOT SET'}...")
-        print(f"  _private_key: {self.client._private_key[:10] if self.client._private_key else 'NOT SET'}... (len={len(self.client._private_key) if self.client._private_key else 0})")
-        print(f"  _trading_account_id: {self.client._trading_account_id}")
+        emit([
+            f"✅ Set client attributes:",
+            f"  _api_key: {self.client._api_key[:10] if self.client._api_key else 'NOT SET'}...",
+            f"  _private_key: {self.client._private_key[:10] if self.client._private_key else 'NOT SET'}... (len={len(self.client._private_key) if self.client._private_key else 0})",
+            f"  _trading_account_id: {self.client._trading_account_id}",
+        ])
         
         # Verify all are set
         if not self.client._api_key:
@@ -123,369 +401,719 @@ class GRVTVolumeBot:
             raise ValueError("Failed to set _private_key")
         if not self.client._trading_account_id:
             raise ValueError("Failed to set _trading_account_id")
+
+        await self.tune_http_session()
+
+        # Market and order type never change - bind them once
+        # CCXT Pro create_order requires order_type as second parameter
+        # Must be 'limit' or 'market', not 'buy'/'sell'
+        self._place = functools.partial(self.client.create_order, self.market, 'limit')
+        # cancel_all_orders(params={}) takes no symbol; filter by kind/base/quote
+        # so it only touches this market's orders on the sub account
+        cancel_filter = {'base': self._base_ccy, 'quote': self.market.split('_')[1]}
+        if self.market.endswith('_Perp'):
+            cancel_filter['kind'] = 'PERPETUAL'
+        self._cancel_all = functools.partial(self.client.cancel_all_orders, cancel_filter)
+
+        # Only use create_orders when the SDK both defines and advertises it;
+        # ccxt-style clients define a stub that raises NotSupported
+        has = getattr(self.client, 'has', None) or {}
+        if has.get('createOrders') is True:
+            self._create_orders = getattr(self.client, 'create_orders', None)
+        logger.info(f"📦 Order submission: {'bulk create_orders' if self._create_orders else 'concurrent create_order'}")
         
         # Load markets
-        print("📡 Loading markets...")
+        logger.info("📡 Loading markets...")
         try:
             await self.client.load_markets()
-            print(f"✅ Loaded {len(self.client.markets)} markets")
+            logger.info(f"✅ Loaded {len(self.client.markets)} markets")
             
             # Check if our market exists
             if self.market in self.client.markets:
-                print(f"✅ Market {self.market} found")
+                logger.info(f"✅ Market {self.market} found")
+                self.load_market_precision(self.client.markets[self.market])
             else:
-                print(f"❌ Market {self.market} not found!")
-                print(f"Available markets: {list(self.client.markets.keys())[:10]}...")
+                logger.error(f"❌ Market {self.market} not found!\n"
+                             f"Available markets: {list(self.client.markets.keys())[:10]}...")
                 raise ValueError(f"Market {self.market} not available")
         except Exception as e:
-            print(f"❌ Error loading markets: {e}")
+            logger.error(f"❌ Error loading markets: {e}")
             raise
         
-        print("🚀 GRVT VOLUME GENERATOR - FULLY CONFIGURABLE")
-        print("=" * 75)
-        print(f"Environment: {os.getenv('ENVIRONMENT', 'testnet').upper()}")
-        print(f"Market: {self.market}")
-        print(f"Sub Account: {os.getenv('GRVT_SUB_ACCOUNT_ID', '')[:10]}...")
-        print(f"Investment: ${self.investment_usdc:.2f} (Leverage: {self.leverage}x)")
-        print(f"Effective Capital: ${self.investment_usdc * self.leverage:.2f}")
-        print()
-        print("🎯 TARGETS:")
-        print(f"  Volume Goal: ${self.target_volume:,.0f} in {self.target_hours}h")
-        print(f"  Hourly Goal: ${self.target_volume/self.target_hours:,.0f}")
-        print(f"  Max Loss: ${self.max_loss:.2f}")
-        print()
-        print("⚙️ STRATEGY CONFIG:")
-        print(f"  Spread: {self.spread_bps/100:.3f}% ({self.spread_bps:.0f} bps)")
-        print(f"  Orders: {self.orders_per_side * 2} total ({self.orders_per_side} each side)")
-        print(f"  Order Size: {self.order_size_percent * 100:.1f}% of capital")
-        print(f"  Refresh: Every {self.refresh_interval:.1f}s")
-        print()
-        
-        self.start_time = datetime.now()
+        emit([
+            "🚀 GRVT VOLUME GENERATOR - FULLY CONFIGURABLE",
+            "=" * 75,
+            f"Environment: {self.environment.upper()}",
+            f"Market: {self.market}",
+            f"Sub Account: {str(self.trading_account_id)[:10]}...",
+            f"Investment: ${self.investment_usdc:.2f} (Leverage: {self.leverage}x)",
+            f"Effective Capital: ${self.investment_usdc * self.leverage:.2f}",
+            "",
+            "🎯 TARGETS:",
+            f"  Volume Goal: ${self.target_volume:,.0f} in {self.target_hours}h",
+            f"  Hourly Goal: ${self.target_volume/self.target_hours:,.0f}",
+            f"  Max Loss: ${self.max_loss:.2f}",
+            "",
+            "⚙️ STRATEGY CONFIG:",
+            f"  Spread: {self.spread_bps/100:.3f}% ({self.spread_bps:.0f} bps)",
+            f"  Orders: {self.orders_per_side * 2} total ({self.orders_per_side} each side)",
+            f"  Order Size: {self.order_size_percent * 100:.1f}% of capital",
+            f"  Refresh: Every {self.refresh_interval:.1f}s",
+            "",
+        ])
         
-    async def get_orderbook(self):
-        """Get current orderbook"""
+        self._start_mono = time.monotonic()
+        self._last_fill_ts = time.time_ns()
+
+        # Poll the orderbook in the background so cycles read it from memory
+        self.running = True
+        self._book_task = asyncio.create_task(self._book_loop())
         try:
-            orderbook = await self.client.fetch_order_book(self.market)
-            
-            # Debug output on first cycle
-            if self.cycle_count == 1:
-                print(f"DEBUG - Orderbook type: {type(orderbook)}")
-                print(f"DEBUG - Orderbook keys: {orderbook.keys() if isinstance(orderbook, dict) else 'Not a dict'}")
-                if 'bids' in orderbook:
-                    print(f"DEBUG - Bids type: {type(orderbook['bids'])}")
-                    if orderbook['bids']:
-                        print(f"DEBUG - First bid: {orderbook['bids'][0]}")
-            
-            if not orderbook or not isinstance(orderbook, dict):
-                return None
-                
-            if 'bids' not in orderbook or 'asks' not in orderbook:
-                return None
-            
-            bids = orderbook['bids']
-            asks = orderbook['asks']
-            
-            if not bids or not asks:
-                return None
-            
+            await asyncio.wait_for(self._book_ready.wait(), 10)
+        except asyncio.TimeoutError:
+            logger.warning("⚠️ No orderbook snapshot yet, falling back to REST until the feed catches up")
+        
+    async def tune_http_session(self):
+        """Swap the SDK's aiohttp session for one with a long-lived connection pool"""
+        old_session = getattr(self.client, '_session', None)
+        if not isinstance(old_session, aiohttp.ClientSession):
+            return
+
+        # Keep sockets (and their TLS sessions) open between cycles and cache DNS,
+        # so each order reuses a warm connection instead of a fresh handshake
+        connector = aiohttp.TCPConnector(
+            limit=64,
+            limit_per_host=32,
+            keepalive_timeout=90,
+            ttl_dns_cache=300
+        )
+        self.client._session = aiohttp.ClientSession(
+            connector=connector,
+            headers=dict(old_session.headers)
+        )
+        await old_session.close()
+
+        # Re-apply the auth cookie the SDK set on the original session
+        self.client.update_session_with_cookie()
+
+    async def _book_loop(self):
+        """Keep self.latest_orderbook fresh in the background"""
+        # GrvtCcxtPro only offers REST snapshots. Poll once per refresh_interval,
+        # the rate the cycle used to fetch at, so moving the read off the
+        # critical path adds no API load.
+        errors = 0
+
+        while self.running:
+            try:
+                orderbook = await self.client.fetch_order_book(self.market)
+
+                # Debug output on first update
+                if self._book_updates == 0:
+                    logger.debug("DEBUG - Orderbook type: %s", type(orderbook))
+                    logger.debug("DEBUG - Orderbook keys: %s", orderbook.keys() if isinstance(orderbook, dict) else 'Not a dict')
+                    if isinstance(orderbook, dict) and orderbook.get('bids'):
+                        logger.debug("DEBUG - Bids type: %s", type(orderbook['bids']))
+                        logger.debug("DEBUG - First bid: %s", orderbook['bids'][0])
+
+                book = self._parse_orderbook(orderbook)
+                self.latest_orderbook = book
+                if book:
+                    self._book_ready.set()
+                self._book_updates += 1
+                errors = 0
+
+                # Wake the main loop once our quotes are at least a tick stale
+                if book and (abs(book['best_bid'] - self._quoted_bid) >= self.tick_size
+                             or abs(book['best_ask'] - self._quoted_ask) >= self.tick_size):
+                    self._book_dirty.set()
+
+                await asyncio.sleep(self.refresh_interval)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Drop the stale book so cycles fall back to a fresh snapshot
+                self.latest_orderbook = None
+                errors += 1
+                logger.error(f"❌ Error getting orderbook: {e}")
+                if errors <= 2:
+                    logger.debug("DEBUG - Traceback:", exc_info=True)
+                await asyncio.sleep(min(2 ** (errors - 1), self.max_backoff))
+
+    def _parse_orderbook(self, orderbook):
+        """Extract best bid/ask, mid price and spread from a raw orderbook"""
+        if not orderbook or not isinstance(orderbook, dict):
+            return None
+
+        bids = orderbook.get('bids')
+        asks = orderbook.get('asks')
+
+        if not bids or not asks:
+            return None
+
+        # The feed's level format doesn't change, so detect it once
+        extract_prices = self._extract_prices
+        if extract_prices is None:
             # GRVT format: list of dicts with 'price' and 'size' keys
             # [{'price': '121250.0', 'size': '0.013', 'num_orders': 3}, ...]
             if isinstance(bids[0], dict):
-                best_bid_price = float(bids[0]['price'])
-                best_ask_price = float(asks[0]['price'])
+                extract_prices = grvt_top_of_book
             # Standard CCXT format: [[price, size], ...]
             elif isinstance(bids[0], (list, tuple)):
-                best_bid_price = float(bids[0][0])
-                best_ask_price = float(asks[0][0])
+                extract_prices = ccxt_top_of_book
             else:
-                print(f"DEBUG - Unknown bid format: {type(bids[0])}")
+                logger.debug("DEBUG - Unknown bid format: %s", type(bids[0]))
                 return None
-            
-            if best_bid_price == 0 or best_ask_price == 0:
-                return None
-                
-            mid_price = (best_bid_price + best_ask_price) / 2
-            spread = ((best_ask_price - best_bid_price) / mid_price) * 100
-            
-            return {
-                'best_bid': best_bid_price,
-                'best_ask': best_ask_price,
-                'mid_price': mid_price,
-                'spread': spread
-            }
+            self._extract_prices = extract_prices
+
+        try:
+            best_bid_price, best_ask_price = extract_prices(bids, asks)
+        except (KeyError, IndexError, TypeError):
+            # Format changed under us (e.g. client swap) - re-detect next time
+            self._extract_prices = None
+            return None
+
+        # Also guarantees mid_price > 0 for the spread division below
+        if best_bid_price <= 0 or best_ask_price <= 0:
+            return None
+
+        mid_price = (best_bid_price + best_ask_price) * 0.5
+        spread = ((best_ask_price - best_bid_price) / mid_price) * 100
+
+        return {
+            'best_bid': best_bid_price,
+            'best_ask': best_ask_price,
+            'mid_price': mid_price,
+            'spread': spread
+        }
+
+    async def get_orderbook(self):
+        """Get current orderbook from the background feed"""
+        if self.latest_orderbook is not None:
+            return self.latest_orderbook
+
+        # Feed has no book yet (startup or resync) - take a one-off snapshot
+        try:
+            return self._parse_orderbook(await self.client.fetch_order_book(self.market))
         except Exception as e:
-            print(f"❌ Error getting orderbook: {e}")
-            import traceback
-            if self.cycle_count <= 2:
-                print(f"DEBUG - Traceback: {traceback.format_exc()}")
+            self._record_failure(e)
+            logger.error(f"❌ Error getting orderbook: {e}")
             return None
             
+    def _remember_fill(self, trade_id):
+        """Record a fill id; return False if it was already counted"""
+        if trade_id in self._recent_fill_ids:
+            return False
+        if len(self._recent_fills) == self._recent_fills.maxlen:
+            self._recent_fill_ids.discard(self._recent_fills[0])
+        self._recent_fills.append(trade_id)
+        self._recent_fill_ids.add(trade_id)
+        return True
+
     async def get_account_volume(self):
         """Get actual volume from trades"""
         try:
-            # fetch_my_trades(symbol) - trading_account_id should be set on client
-            trades = await self.client.fetch_my_trades(self.market)
+            # Only ask for fills since the newest one already counted
+            # (GRVT's `since` is the fill history start_time, in nanoseconds)
+            response = await self.client.fetch_my_trades(
+                self.market, since=self._last_fill_ts, limit=FILLS_PAGE_LIMIT
+            )
+            # The SDK returns the raw {'result': [...], 'next': ...} payload
+            trades = response.get('result') if isinstance(response, dict) else response
 
             # Debug on first cycle
             if self.cycle_count == 1:
-                print(f"DEBUG - trades type: {type(trades)}")
-                print(f"DEBUG - trades value: {trades}")
+                logger.debug("DEBUG - trades type: %s", type(trades))
+                logger.debug("DEBUG - trades value: %s", trades)
 
             # Handle if trades is not a list
             if not isinstance(trades, list):
                 if self.cycle_count <= 2:
-                    print(f"⚠️ trades is not a list: {type(trades)}")
+                    logger.warning(f"⚠️ trades is not a list: {type(trades)}")
                 return self.total_volume, self.total_trades
 
-            volume = 0
-            trade_count = 0
-
-            for trade in trades:
-                # Handle different trade formats
-                if not isinstance(trade, dict):
-                    continue
-
-                # Try to get timestamp
-                timestamp = trade.get('timestamp') or trade.get('time') or 0
-                if timestamp == 0:
-                    continue
-
-                trade_time = datetime.fromtimestamp(timestamp / 1000)
-                if trade_time >= self.start_time:
-                    # Try different cost fields
-                    cost = trade.get('cost') or trade.get('amount') or 0
-                    volume += float(cost)
-                    trade_count += 1
-
-            return volume, trade_count
+            volume, count, newest_ts = aggregate_fills(
+                trades, self._last_fill_ts, self._remember_fill
+            )
+            self.total_volume += volume
+            self.total_trades += count
+            self._last_fill_ts = newest_ts
+            return self.total_volume, self.total_trades
         except Exception as e:
+            self._record_failure(e)
             if "trading_account_id" not in str(e) or self.cycle_count > 3:
-                print(f"⚠️ Error getting trades: {e}")
+                logger.warning(f"⚠️ Error getting trades: {e}")
                 if self.cycle_count <= 2:
-                    import traceback
-                    print(f"DEBUG - Traceback:\n{traceback.format_exc()}")
+                    logger.debug("DEBUG - Traceback:", exc_info=True)
             return self.total_volume, self.total_trades
             
     async def cancel_all_orders(self):
         """Cancel all open orders"""
         try:
-            # cancel_all_orders(symbol) - no params parameter
-            await self.client.cancel_all_orders(self.market)
-            await asyncio.sleep(self.delay_after_cancel)
+            await self._order_bucket.acquire()
+            # The SDK returns False for a cancel the exchange didn't ack
+            acked = await self._cancel_all()
+            if acked is not True:
+                raise self._rejection('cancel_all_orders')
+            self._ord_count = 0
+            self._cancel_all_pending = False
+            self._record_success()
+            # The cancel is acked before we return; only wait if configured to
+            if self.delay_after_cancel > 0:
+                await asyncio.sleep(self.delay_after_cancel)
         except Exception as e:
+            self._record_failure(e)
+            self._cancel_all_pending = True
             # Suppress trading_account_id error on first few attempts
             if "trading_account_id" not in str(e) or self.cycle_count > 3:
-                print(f"⚠️ Error canceling orders: {e}")
+                logger.warning(f"⚠️ Error canceling orders: {e}")
             
-    def round_price(self, price):
-        """Round price to valid tick size (0.1 for BTC_USDT_Perp)"""
-        tick_size = 0.1
-        return round(price / tick_size) * tick_size
+    async def cancel_orders(self, order_ids):
+        """Cancel a specific batch of orders by client order id; return the ids that failed"""
+        async def cancel(client_order_id):
+            # The exchange order id may not be known yet ('0x00'), so cancel
+            # by the client order id the order was placed with
+            params = {
+                'sub_account_id': self.trading_account_id,
+                'client_order_id': client_order_id,
+                'time_to_live_ms': CANCEL_TTL_MS
+            }
+            async with self._order_semaphore:
+                await self._order_bucket.acquire()
+                # The SDK returns False rather than raising for a cancel that
+                # wasn't acked; read its stored response before the next
+                # request overwrites it
+                acked = await self.client.cancel_order(None, self.market, params)
+                if acked is not True:
+                    raise self._rejection('cancel_order')
+                return acked
+
+        results = await asyncio.gather(
+            *(cancel(order_id) for order_id in order_ids),
+            return_exceptions=True
+        )
+        # An order that already filled or is gone is off the book. Any other
+        # failed cancel may have left an order live, so sweep with cancel-all
+        # next cycle.
+        failed = [
+            order_id for order_id, r in zip(order_ids, results)
+            if r is not True and not is_order_gone(r)
+        ]
+        if failed:
+            errors = [r for r in results if r is not True and not is_order_gone(r)]
+            error = next((e for e in errors if is_transient(e)), errors[0])
+            self._record_failure(error)
+            if is_rate_limited(error):
+                self._order_bucket.penalize()
+            self._cancel_all_pending = True
+            logger.warning(f"⚠️ Failed to cancel {len(failed)}/{len(order_ids)} orders: {error}")
+        elif results:
+            self._record_success()
+        return failed
+
+    def load_market_precision(self, market_info):
+        """Read tick/min size from market info and precompute rounding constants"""
+        if isinstance(market_info, dict):
+            self.tick_size = float(market_info.get('tick_size') or self.tick_size)
+            self.min_size = float(market_info.get('min_size') or self.min_size)
+
+        # Prices are handled as integers in units of 10^-decimals to avoid FP drift
+        self._price_decimals = max(0, -Decimal(str(self.tick_size)).normalize().as_tuple().exponent)
+        self._price_scale = 10 ** self._price_decimals
+        self._tick_i = round(self.tick_size * self._price_scale)
+        # Sizes get the same treatment in units of the min size's decimals
+        size_decimals = max(0, -Decimal(str(self.min_size)).normalize().as_tuple().exponent)
+        self._size_scale = 10 ** size_decimals
+        self._min_size_i = round(self.min_size * self._size_scale)
+        logger.info(f"  Tick size: {self.tick_size} | Min size: {self.min_size}")
 
     def round_size(self, size):
-        """Round order size to valid step size (0.001 for BTC - larger step)"""
-        step_size = 0.001
-        return round(size / step_size) * step_size
+        """Round order size to valid step size (never below min size)"""
+        steps = round(size * self._size_scale / self._min_size_i)
+        if steps == 0 and size > 0:
+            return self.min_size
+        return steps * self._min_size_i / self._size_scale
+
+    def calculate_order_levels(self, mid_price, spread_amount):
+        """Build buy/sell price ladders, 1% of mid apart, on valid ticks
+
+        Works in scaled integers: bids are floored and asks ceiled to the
+        tick, so quotes never land off-tick or move towards the spread.
+        """
+        levels = min(self.orders_per_side, self.max_orders_to_place)
+        scale = self._price_scale
+        tick_i = self._tick_i
+        step_i = round(0.01 * mid_price * scale)
+        # Floor/ceil when scaling too, or a sub-unit remainder would be rounded
+        # towards the spread before the tick snap (which is a no-op at tick_i == 1).
+        # The inner round() only strips FP noise like 1212257.9999999998.
+        bid_i = math.floor(round((mid_price - spread_amount) * scale, 6))
+        ask_i = math.ceil(round((mid_price + spread_amount) * scale, 6))
+
+        # Both sides share the same offsets from the top of book
+        offsets = range(0, levels * step_i, step_i) if step_i else [0] * levels
+        buy_levels = [(bid_i - off - (bid_i - off) % tick_i) / scale for off in offsets]
+        sell_levels = [(ask_i + off + (-(ask_i + off)) % tick_i) / scale for off in offsets]
+        return buy_levels, sell_levels
 
-    async def place_orders(self, orderbook):
-        """Place buy and sell orders"""
+    async def place_orders(self, orderbook, cancel_task=None, stale=()):
+        """Place buy and sell orders (after cancel_task, if given, completes)
+
+        stale lists the previous ladder's (client_order_id, side, price); those orders
+        are cancelled once the new ones are up.
+        """
         mid_price = orderbook['mid_price']
-        spread_amount = mid_price * (self.spread_bps / 10000)
+        spread_amount = mid_price * self._spread_frac
 
         # Calculate order size
-        capital = self.investment_usdc * self.leverage
-        order_value = capital * self.order_size_percent
-        order_size = order_value / mid_price
+        order_size = self._order_value / mid_price
         order_size = self.round_size(order_size)  # Round to step size
 
-        # Get trading account ID
-        trading_account_id = os.getenv('GRVT_SUB_ACCOUNT_ID') or os.getenv('GRVT_TRADING_ACCOUNT_ID')
+        # Per-cycle detail only on the first cycle and alongside status reports
+        verbose = self.cycle_count == 1 or time.monotonic() - self._last_status >= self.status_interval
+        if verbose:
+            emit([
+                f"\n📊 Cycle {self.cycle_count} - Orderbook:",
+                f"  Best Bid: ${orderbook['best_bid']:,.2f}",
+                f"  Best Ask: ${orderbook['best_ask']:,.2f}",
+                f"  Mid Price: ${mid_price:,.2f}",
+                f"  Spread: {orderbook['spread']:.3f}%",
+                f"  Order size: {order_size:.6f} {self._base_ccy}",
+                f"\nPlacing {self.orders_per_side} buy + {self.orders_per_side} sell orders...",
+            ])
 
-        buy_orders = 0
-        sell_orders = 0
+        buy_levels, sell_levels = self.calculate_order_levels(mid_price, spread_amount)
 
-        print(f"\n📊 Cycle {self.cycle_count} - Orderbook:")
-        print(f"  Best Bid: ${orderbook['best_bid']:,.2f}")
-        print(f"  Best Ask: ${orderbook['best_ask']:,.2f}")
-        print(f"  Mid Price: ${mid_price:,.2f}")
-        print(f"  Spread: {orderbook['spread']:.3f}%")
-        print(f"  Order size: {order_size:.6f} {self.market.split('_')[0]}")
-        print(f"\nPlacing {self.orders_per_side} buy + {self.orders_per_side} sell orders...")
+        params = self._order_params
 
-        # Place buy orders
-        for i in range(min(self.orders_per_side, self.max_orders_to_place)):
-            try:
-                price = mid_price - spread_amount - (i * 0.01 * mid_price)
-                price = self.round_price(price)  # Round to tick size
-                
-                # GRVT requires sub_account_id in the order params
-                params = {
-                    'sub_account_id': trading_account_id
+        # Debug on first order
+        if self.cycle_count == 1 and buy_levels:
+            logger.debug(
+                "DEBUG - Calling create_order with:\n"
+                "  symbol: %s\n"
+                "  side: buy\n"
+                "  amount: %s\n"
+                "  price: %s\n"
+                "  params: %s",
+                self.market, order_size, buy_levels[0], params
+            )
+
+        # New orders must not race the cancel-all of the previous ladder
+        if cancel_task is not None:
+            await cancel_task
+
+        # Nor may they cross what's left of it: post-only orders would be
+        # rejected, and plain limits would trade against our own quotes. Pull
+        # the crossing old levels first, and skip new levels that would still
+        # cross one whose cancel failed.
+        if stale and buy_levels and sell_levels:
+            crossing = [
+                (order_id, side, price) for order_id, side, price in stale
+                if (side == 'sell' and price <= buy_levels[0])
+                or (side == 'buy' and price >= sell_levels[0])
+            ]
+            if crossing:
+                failed = set(await self.cancel_orders([o[0] for o in crossing]))
+                stale = [o for o in stale if o not in crossing]
+                stuck = [o for o in crossing if o[0] in failed]
+                lowest_ask = min((p for _, side, p in stuck if side == 'sell'), default=math.inf)
+                highest_bid = max((p for _, side, p in stuck if side == 'buy'), default=-math.inf)
+                buy_levels = [p for p in buy_levels if p < lowest_ask]
+                sell_levels = [p for p in sell_levels if p > highest_bid]
+
+        specs = [('buy', price) for price in buy_levels] + [('sell', price) for price in sell_levels]
+        results = await self.place_orders_bulk(specs, order_size, params)
+        buy_results = results[:len(buy_levels)]
+        sell_results = results[len(buy_levels):]
+
+        buy_orders = self._report_results('buy', buy_levels, buy_results, verbose)
+        sell_orders = self._report_results('sell', sell_levels, sell_results, verbose)
+
+        # One failed batch counts as one failure, not one per order. Any
+        # rate-limited order counts even if others in the batch got through.
+        errors = [
+            r if isinstance(r, Exception) else RequestRejected()
+            for r in results if not order_id_of(r)
+        ]
+        rate_limited = next((e for e in errors if is_rate_limited(e)), None)
+        if rate_limited is not None:
+            self._record_failure(rate_limited)
+        elif buy_orders + sell_orders > 0:
+            self._record_success()
+        elif errors:
+            self._record_failure(errors[0])
+
+        # The new ladder is up - now retire the old one
+        if stale:
+            await self.cancel_orders([order_id for order_id, _, _ in stale])
+
+        if verbose:
+            logger.info(f"\nSummary: {buy_orders} buy + {sell_orders} sell orders placed")
+
+    async def place_orders_bulk(self, specs, order_size, params):
+        """Submit all (side, price) specs in one request, one result per spec"""
+        # Reserve a contiguous block of client order ids for this batch
+        base = self.client_order_id
+        self.client_order_id = (base + len(specs)) % CLIENT_ORDER_ID_SPAN
+        order_params = [
+            {**params, 'client_order_id': str(CLIENT_ORDER_ID_BASE + (base + i) % CLIENT_ORDER_ID_SPAN)}
+            for i in range(len(specs))
+        ]
+
+        create_orders = self._create_orders
+        if create_orders is not None:
+            orders = [
+                {
+                    'symbol': self.market,
+                    'type': 'limit',
+                    'side': side,
+                    'amount': order_size,
+                    'price': price,
+                    'params': order_params[i]
                 }
-                if self.use_post_only:
-                    params['post_only'] = True  # Try snake_case
-                
-                # Debug on first order
-                if i == 0 and self.cycle_count == 1:
-                    print(f"DEBUG - Calling create_order with:")
-                    print(f"  symbol: {self.market}")
-                    print(f"  side: buy")
-                    print(f"  amount: {order_size}")
-                    print(f"  price: {price}")
-                    print(f"  params: {params}")
-                
-                # CCXT Pro create_order requires order_type as second parameter
-                # Must be 'limit' or 'market', not 'buy'/'sell'
-                await self.client.create_order(
-                    self.market,
-                    'limit',  # order_type: 'limit' or 'market'
-                    'buy',    # side: 'buy' or 'sell'
-                    order_size,
-                    price,
-                    params
-                )
-                
-                buy_orders += 1
-                if i == 0:
-                    print(f"✅ BUY @ ${price:,.2f}")
-                    
-                await asyncio.sleep(self.delay_between_orders)
+                for i, (side, price) in enumerate(specs)
+            ]
+            try:
+                await self._order_bucket.acquire(len(orders))
+                results = await create_orders(orders)
+                # Rejected orders come back as {} (see place_order)
+                if not all(order_id_of(r) for r in results):
+                    rejection = self._rejection('create_orders')
+                    results = [r if order_id_of(r) else rejection for r in results]
             except Exception as e:
-                if "post" not in str(e).lower() or i == 0:
-                    print(f"⚠️ Buy order {i+1} failed: {e}")
+                results = [e] * len(specs)
+        else:
+            # SDK has no bulk endpoint - submit every level at once instead
+            results = await asyncio.gather(
+                *(
+                    self.place_order(side, price, order_size, order_params[i])
+                    for i, (side, price) in enumerate(specs)
+                ),
+                return_exceptions=True
+            )
+
+        # Only 429s slow the bucket down - other failures (post-only rejects,
+        # network errors) are the circuit breaker's job. Speed back up once
+        # the exchange actually assigned order ids.
+        if any(isinstance(r, Exception) and is_rate_limited(r) for r in results):
+            self._order_bucket.penalize()
+        elif any(order_id_of(r) for r in results):
+            self._order_bucket.reward()
+
+        # Record live orders into the preallocated slots, overwriting last cycle's
+        count = 0
+        for (side, price), result, order_params_i in zip(specs, results, order_params):
+            if order_id_of(result):
+                self._ord_ids[count] = order_params_i['client_order_id']
+                self._ord_sides[count] = side
+                self._ord_prices[count] = price
+                count += 1
+        self._ord_count = count
+        return results
+
+    async def place_order(self, side, price, order_size, params):
+        """Place a single limit order, gated by the concurrency semaphore"""
+        async with self._order_semaphore:
+            await self._order_bucket.acquire()
+            result = await self._place(side, order_size, price, params)
+        # The SDK doesn't raise on HTTP errors - a rejected order comes back
+        # as {}, with the exchange's response kept on the client. Read it
+        # now, before another order's response overwrites it.
+        if not order_id_of(result):
+            raise self._rejection('create_order')
+        return result
+
+    def _rejection(self, endpoint):
+        """RequestRejected built from the SDK's last stored response for endpoint"""
+        responses = getattr(self.client, '_path_return_value_map', None) or {}
+        for path, response in responses.items():
+            if path.endswith(endpoint):
+                return RequestRejected(response)
+        return RequestRejected()
+
+    def _record_failure(self, error):
+        """Count an API call that failed on rate limits or the network"""
+        if is_transient(error):
+            self._consecutive_fails += 1
+
+    def _record_success(self):
+        """Reset backoff after a healthy API call"""
+        self._consecutive_fails = 0
+        self._backoff = 1.0
+
+    def _report_results(self, side, levels, results, verbose=True):
+        """Print outcome of one side of the ladder and return number of orders placed
+
+        Failures are always reported; the top-of-ladder fill price only if verbose.
+        """
+        placed = 0
+        for i, (price, result) in enumerate(zip(levels, results)):
+            # Only an order the exchange assigned an id to is live
+            if not order_id_of(result):
+                if not isinstance(result, Exception):
+                    result = RequestRejected()
+                if "post" not in str(result).lower() or i == 0:
+                    logger.warning(f"⚠️ {side.capitalize()} order {i+1} failed: {result}")
                     if i == 0 and self.cycle_count == 1:
-                        import traceback
-                        print(f"DEBUG - Full traceback:\n{traceback.format_exc()}")
-                if i == 0:
-                    break  # Stop if first order fails
-                
-        # Place sell orders
-        for i in range(min(self.orders_per_side, self.max_orders_to_place)):
-            try:
-                price = mid_price + spread_amount + (i * 0.01 * mid_price)
-                price = self.round_price(price)  # Round to tick size
+                        logger.debug("DEBUG - Full traceback:", exc_info=result)
+                continue
+            placed += 1
+            if i == 0 and verbose:
+                logger.info(f"✅ {side.upper()} @ ${price:,.2f}")
+        return placed
 
-                params = {
-                    'sub_account_id': trading_account_id
-                }
-                if self.use_post_only:
-                    params['post_only'] = True
-                
-                await self.client.create_order(
-                    self.market,
-                    'limit',  # order_type: 'limit' or 'market'
-                    'sell',   # side: 'buy' or 'sell'
-                    order_size,
-                    price,
-                    params
-                )
-                
-                sell_orders += 1
-                if i == 0:
-                    print(f"✅ SELL @ ${price:,.2f}")
-                    
-                await asyncio.sleep(self.delay_between_orders)
-            except Exception as e:
-                if "post" not in str(e).lower() or i == 0:
-                    print(f"⚠️ Sell order {i+1} failed: {e}")
-                if i == 0:
-                    break
-                
-        print(f"\nSummary: {buy_orders} buy + {sell_orders} sell orders placed")
-        
     def print_status(self, orderbook):
         """Print status update"""
-        elapsed = datetime.now() - self.start_time
-        remaining = timedelta(hours=self.target_hours) - elapsed
+        elapsed_s = time.monotonic() - self._start_mono
+        remaining_s = self.target_hours * 3600 - elapsed_s
         
         # Format time
-        elapsed_str = str(elapsed).split('.')[0]
-        remaining_str = f"{remaining.total_seconds()/3600:.1f}h"
+        elapsed_str = str(timedelta(seconds=int(elapsed_s)))
+        remaining_str = f"{remaining_s/3600:.1f}h"
         
         # Calculate metrics
         volume_pct = (self.total_volume / self.target_volume) * 100
-        current_rate = (self.total_volume / elapsed.total_seconds()) * 3600 if elapsed.total_seconds() > 0 else 0
+        current_rate = (self.total_volume / elapsed_s) * 3600 if elapsed_s > 0 else 0
         projected_24h = current_rate * 24
-        required_rate = self.target_volume / self.target_hours
         
-        print("\n" + "=" * 75)
-        print(f"⏱️ {elapsed_str} elapsed | {remaining_str} left | Price: ${orderbook['mid_price']:,.2f}")
-        print(f"📊 Orders: {self.orders_per_side} BUY + {self.orders_per_side} SELL | Spread: {orderbook['spread']:.3f}%")
-        print(f"\n💰 VOLUME (from trades):")
-        print(f"  Current: ${self.total_volume:,.0f} / ${self.target_volume:,.0f} ({volume_pct:.1f}%)")
-        print(f"  Trades: {self.total_trades}")
-        print(f"\n📈 PERFORMANCE:")
-        print(f"  Current Rate: ${current_rate:,.0f}/hour")
-        print(f"  24h Projection: ${projected_24h:,.0f}")
-        print(f"  Required Rate: ${required_rate:,.0f}/hour")
-        print(f"\n💸 COSTS:")
-        print(f"  🎉 ZERO GAS FEES - ZKSync powered!")
-        print(f"  Loss (spread): ${self.total_loss:.2f}")
-        print("=" * 75)
+        emit([
+            "\n" + "=" * 75,
+            f"⏱️ {elapsed_str} elapsed | {remaining_str} left | Price: ${orderbook['mid_price']:,.2f}",
+            f"📊 Orders: {self.orders_per_side} BUY + {self.orders_per_side} SELL | Spread: {orderbook['spread']:.3f}%",
+            f"\n💰 VOLUME (from trades):",
+            f"  Current: ${self.total_volume:,.0f} / {self._target_volume_fmt} ({volume_pct:.1f}%)",
+            f"  Trades: {self.total_trades}",
+            f"\n📈 PERFORMANCE:",
+            f"  Current Rate: ${current_rate:,.0f}/hour",
+            f"  24h Projection: ${projected_24h:,.0f}",
+            f"  Required Rate: {self._required_rate_fmt}",
+            f"\n💸 COSTS:",
+            f"  🎉 ZERO GAS FEES - ZKSync powered!",
+            f"  Loss (spread): ${self.total_loss:.2f}",
+            "=" * 75,
+        ])
         
     async def run(self):
         """Main bot loop"""
         await self.initialize()
         
-        print("🔄 Starting order refresh ({:.1f}s cycles)...\n".format(self.refresh_interval))
+        logger.info("🔄 Starting order refresh ({:.1f}s cycles)...\n".format(self.refresh_interval))
         
-        last_status = time.time()
+        self._last_status = time.monotonic()
         
         try:
             while True:
                 self.cycle_count += 1
+                now = time.monotonic()  # One clock read per cycle
+
+                # Circuit breaker: stop hammering the API while it keeps failing
+                if self._consecutive_fails >= self.max_consecutive_fails:
+                    logger.info(f"⏸️ {self._consecutive_fails} consecutive API failures, backing off {self._backoff:.0f}s...")
+                    await asyncio.sleep(self._backoff)
+                    self._backoff = min(self._backoff * 2, self.max_backoff)
+                    # Half-open: allow one trial cycle, a further failure re-opens
+                    self._consecutive_fails = self.max_consecutive_fails - 1
+                    continue
                 
-                # Get orderbook
-                orderbook = await self.get_orderbook()
+                # Poll fills over REST alongside the rest of the cycle
+                volume_task = asyncio.create_task(self.get_account_volume())
+
+                # Replace the previous ladder: the new quotes go up first and the
+                # old batch is cancelled by id afterwards, so the book is never
+                # left empty. Without known ids (first cycle, or a failed cancel)
+                # cancel everything while the book is read and the ladder built;
+                # place_orders then waits for it before submitting.
+                count = self._ord_count
+                stale = list(zip(self._ord_ids[:count], self._ord_sides[:count], self._ord_prices[:count]))
+                cancel_task = None
+                if not stale or self._cancel_all_pending:
+                    cancel_task = asyncio.create_task(self.cancel_all_orders())
+                    stale = []
+
+                # Get orderbook - a plain memory read once the feed is live
+                orderbook = self.latest_orderbook or await self.get_orderbook()
                 if not orderbook:
-                    print("⚠️ Failed to get orderbook, retrying...")
+                    # Quotes are stale without a book - pull them all
+                    await (cancel_task or self.cancel_all_orders())
+                    self.total_volume, self.total_trades = await volume_task
+                    logger.warning("⚠️ Failed to get orderbook, retrying...")
                     await asyncio.sleep(5)
                     continue
                     
-                # Cancel existing orders
-                await self.cancel_all_orders()
-                
-                # Place new orders
-                await self.place_orders(orderbook)
+                # A mid move under half a tick rebuilds the exact same ladder, so
+                # leave it standing unless some of it filled or failed to place.
+                # Fills come from this cycle's REST poll, so a filled level is
+                # replaced on the cycle after the fill lands.
+                mid_price = orderbook['mid_price']
+                if (cancel_task is None
+                        and self._last_mid is not None
+                        and abs(mid_price - self._last_mid) < self.tick_size * 0.5
+                        and self._ord_count == len(self._ord_ids)
+                        and self.total_trades == self._quoted_trades):
+                    logger.debug("DEBUG - Mid unchanged at $%.2f, keeping quotes", mid_price)
+                else:
+                    # Place new orders
+                    await self.place_orders(orderbook, cancel_task, stale)
+                    self._last_mid = mid_price
+                    self._quoted_trades = self.total_trades
+                self._quoted_bid = orderbook['best_bid']
+                self._quoted_ask = orderbook['best_ask']
                 
                 # Update volume from trades
-                self.total_volume, self.total_trades = await self.get_account_volume()
+                self.total_volume, self.total_trades = await volume_task
                 
                 # Estimate loss
-                self.total_loss = self.total_volume * (self.spread_bps / 10000)
+                self.total_loss = self.total_volume * self._spread_frac
                 
                 # Print status
-                if time.time() - last_status >= self.status_interval:
+                if now - self._last_status >= self.status_interval:
                     self.print_status(orderbook)
-                    last_status = time.time()
+                    self._last_status = now
                     
                 # Check stop conditions
                 if self.total_loss >= self.max_loss:
-                    print(f"\n🛑 Max loss reached: ${self.total_loss:.2f}")
+                    logger.info(f"\n🛑 Max loss reached: ${self.total_loss:.2f}")
                     break
                     
                 if self.total_volume >= self.target_volume:
-                    print(f"\n🎉 Target volume reached: ${self.total_volume:,.0f}")
+                    logger.info(f"\n🎉 Target volume reached: ${self.total_volume:,.0f}")
                     break
                     
-                elapsed = datetime.now() - self.start_time
-                if elapsed >= timedelta(hours=self.target_hours):
-                    print(f"\n⏰ Time limit reached: {self.target_hours}h")
+                if now - self._start_mono >= self.target_hours * 3600:
+                    logger.info(f"\n⏰ Time limit reached: {self.target_hours}h")
                     break
                     
-                # Wait for next cycle
-                await asyncio.sleep(self.refresh_interval)
+                # Wait until the book moves (at most refresh_interval), but never
+                # repost faster than min_repost_interval. Deadlines are measured
+                # from the cycle start, so time spent in the cycle doesn't add drift.
+                await asyncio.sleep(max(0.0, now + self.min_repost_interval - time.monotonic()))
+                try:
+                    await asyncio.wait_for(
+                        self._book_dirty.wait(),
+                        max(0.0, now + self.refresh_interval - time.monotonic())
+                    )
+                except asyncio.TimeoutError:
+                    pass
+                self._book_dirty.clear()
                 
         except KeyboardInterrupt:
-            print("\n\n⚠️ Stopping gracefully...")
+            logger.warning("\n\n⚠️ Stopping gracefully...")
             await self.cancel_all_orders()
             if orderbook:
                 self.print_status(orderbook)
-            print("\n✅ Bot stopped.")
+            logger.info("\n✅ Bot stopped.")
         finally:
+            self.running = False
+            if self._book_task:
+                self._book_task.cancel()
             await self.client.close()
             
 if __name__ == "__main__":
+    # uvloop is optional - a faster drop-in event loop where it is installed
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
     bot = GRVTVolumeBot()
     asyncio.run(bot.run())